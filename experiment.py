@@ -7,10 +7,12 @@ experiment.py — Extended evaluation suite
 """
 
 import time, statistics, random
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import matplotlib.pyplot as plt
-import os
-from rstar_tree import RTree, RStarTree, make_point_rect, random_points, clustered_points, Rect
+from rstar_tree import RTree, RStarTree, make_point_rect, make_point_rects_bulk, random_points, clustered_points, Rect
 
 # Create results directory
 RESULTS_DIR = "results"
@@ -24,25 +26,93 @@ def save_results(df, filename):
 # Set seed for reproducibility
 random.seed(42)
 
-def build(tree_cls, pts, max_entries=12):
-    """Build tree and measure insertion time"""
+def build(tree_cls, pts, max_entries=12, bulk=False):
+    """
+    Build tree and measure insertion time.
+
+    bulk=True uses Hilbert-sorted bulk loading, which is much faster and
+    packs a better tree — but it bypasses the insertion algorithm, so
+    R-tree and R*-tree come out identical. The experiments compare the
+    two insertion algorithms, so they keep the default one-at-a-time path.
+    """
     t = tree_cls(max_entries=max_entries)
-    start = time.time()
-    for i, (x, y) in enumerate(pts):
-        t.insert(make_point_rect(x, y, 0.01), i)
+    if bulk:
+        rects = make_point_rects_bulk(pts, 0.01)
+        start = time.time()
+        t.bulk_load(rects, range(len(rects)))
+    else:
+        start = time.time()
+        for i, (x, y) in enumerate(pts):
+            t.insert_point(x, y, 0.01, i)
     build_time = time.time() - start
     return t, build_time
 
+# Points per dataset below which forking two build workers costs more
+# than the builds themselves
+PARALLEL_BUILD_THRESHOLD = 1000
+
+
+def _build_one(tree_cls, pts, max_entries, bulk):
+    return build(tree_cls, pts, max_entries, bulk)
+
+
+def build_pair(pts, max_entries=12, bulk=False):
+    """
+    Build the R-tree and the R*-tree for one dataset concurrently.
+
+    The two builds are independent and the build path is pure Python, so
+    they go to two worker processes (threads would serialize on the GIL);
+    each worker times its own insertion loop and the finished trees are
+    pickled back. Small datasets build serially.
+
+    Returns ((rtree, rtree_build_time), (rstar, rstar_build_time)).
+    """
+    if len(pts) <= PARALLEL_BUILD_THRESHOLD:
+        return (build(RTree, pts, max_entries, bulk),
+                build(RStarTree, pts, max_entries, bulk))
+    with ProcessPoolExecutor(max_workers=2) as ex:
+        fut_rt = ex.submit(_build_one, RTree, pts, max_entries, bulk)
+        fut_rs = ex.submit(_build_one, RStarTree, pts, max_entries, bulk)
+        return fut_rt.result(), fut_rs.result()
+
+
 def random_windows(k, w=0.08):
-    wins = []
-    for _ in range(k):
-        x = random.random() * (1 - w)
-        y = random.random() * (1 - w)
-        wins.append(make_point_rect(x, y, w))
-    return wins
+    """k query windows of side w, corners drawn in one vectorized call"""
+    corners = random_points(k) * (1 - w)
+    return [make_point_rect(x, y, w) for x, y in corners]
+
+# Windows per batch below which forking workers costs more than it saves
+PARALLEL_QUERY_THRESHOLD = 256
+
+_worker_tree = None  # set per worker process by _init_query_worker
+
+
+def _init_query_worker(tree_bytes):
+    global _worker_tree
+    _worker_tree = pickle.loads(tree_bytes)
+    _worker_tree.freeze()
+
+
+def _query_chunk(wins):
+    """Run one shard of windows in a worker; return per-window visit counts."""
+    visits = []
+    for w in wins:
+        _worker_tree._reset()
+        _worker_tree.range_query(w)
+        visits.append(_worker_tree.node_visits)
+    return visits
+
 
 def evaluate(tree, wins):
     """Measure average node visits and query time"""
+    if len(wins) > PARALLEL_QUERY_THRESHOLD and (os.cpu_count() or 1) > 1:
+        return _evaluate_parallel(tree, wins)
+    tree.freeze()  # flat SoA snapshot; queries run in the JIT kernel
+    if wins:
+        # untimed warm-up: the first kernel call pays numba compile/cache
+        # load (~0.3s) and would otherwise be billed to the first tree
+        tree._reset()
+        tree.range_query(wins[0])
     visits = []
     start = time.time()
     for w in wins:
@@ -52,8 +122,30 @@ def evaluate(tree, wins):
     query_time = time.time() - start
     return statistics.mean(visits), query_time
 
+
+def _evaluate_parallel(tree, wins):
+    """
+    Shard the window batch across CPU cores. The tree is read-only after
+    build, so this is embarrassingly parallel: pickle it once, let each
+    worker unpickle and freeze its own copy, and sum visit counts from
+    the returned shards.
+    """
+    n_workers = os.cpu_count() or 1
+    tree._frozen = None  # workers rebuild their own snapshot
+    tree_bytes = pickle.dumps(tree)
+    chunk = (len(wins) + n_workers - 1) // n_workers
+    shards = [wins[i:i + chunk] for i in range(0, len(wins), chunk)]
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=n_workers,
+                             initializer=_init_query_worker,
+                             initargs=(tree_bytes,)) as ex:
+        visit_shards = list(ex.map(_query_chunk, shards))
+    query_time = time.time() - start
+    visits = [v for shard in visit_shards for v in shard]
+    return statistics.mean(visits), query_time
+
 def tree_height(node, depth=0):
-    """Calculate tree height"""
+    """Calculate tree height by walking (reference; trees track .height)"""
     if node.leaf:
         return depth
     if not node.entries:
@@ -69,6 +161,7 @@ def experiment_distribution(n=2000, queries=100, max_entries=12):
     print("\n=== Experiment 1: Uniform vs Clustered ===")
     
     results = []
+    raw = {}  # (distribution, tree) -> avg node visits, for plotting
     
     for dist_type in ["Uniform", "Clustered"]:
         print(f"\n→ Testing {dist_type} distribution...")
@@ -81,15 +174,12 @@ def experiment_distribution(n=2000, queries=100, max_entries=12):
         
         wins = random_windows(queries)
         
-        # Build and test R-tree
-        rt, rt_build = build(RTree, pts, max_entries)
+        # Build both trees concurrently, then test each
+        (rt, rt_build), (rs, rs_build) = build_pair(pts, max_entries)
         rt_vis, rt_query = evaluate(rt, wins)
-        rt_height = tree_height(rt.root)
-        
-        # Build and test R*-tree
-        rs, rs_build = build(RStarTree, pts, max_entries)
+        rt_height = rt.height
         rs_vis, rs_query = evaluate(rs, wins)
-        rs_height = tree_height(rs.root)
+        rs_height = rs.height
         
         # Calculate speedup
         speedup = ((rt_vis - rs_vis) / rt_vis * 100) if rt_vis > 0 else 0
@@ -112,22 +202,20 @@ def experiment_distribution(n=2000, queries=100, max_entries=12):
             "Tree_Height": rs_height
         })
         
+        raw[(dist_type, "R-tree")] = rt_vis
+        raw[(dist_type, "R*-tree")] = rs_vis
+        
         print(f"  R-tree:  {rt_vis:.2f} visits | R*-tree: {rs_vis:.2f} visits")
         print(f"  Speedup: {speedup:.2f}%")
     
     df = pd.DataFrame(results)
     
-    # Plot comparison
+    # Plot comparison (from the raw dict — no DataFrame mask/filter passes)
     fig, ax = plt.subplots(1, 1, figsize=(8, 5))
     
-    uniform = df[df['Distribution'] == 'Uniform']
-    clustered = df[df['Distribution'] == 'Clustered']
-    
     x = [0, 1]
-    rtree_vals = [float(uniform[uniform['Tree']=='R-tree']['Avg_Node_Visits'].values[0]),
-                   float(clustered[clustered['Tree']=='R-tree']['Avg_Node_Visits'].values[0])]
-    rstar_vals = [float(uniform[uniform['Tree']=='R*-tree']['Avg_Node_Visits'].values[0]),
-                   float(clustered[clustered['Tree']=='R*-tree']['Avg_Node_Visits'].values[0])]
+    rtree_vals = [raw[("Uniform", "R-tree")], raw[("Clustered", "R-tree")]]
+    rstar_vals = [raw[("Uniform", "R*-tree")], raw[("Clustered", "R*-tree")]]
     
     width = 0.35
     ax.bar([i - width/2 for i in x], rtree_vals, width, label='R-tree', color='steelblue')
@@ -155,18 +243,17 @@ def experiment_scalability(sizes=[500, 1000, 2000, 5000], queries=100, max_entri
     print("\n=== Experiment 2: Scalability ===")
     
     results = []
+    raw = {"R-tree": {"visits": [], "build": []},
+           "R*-tree": {"visits": [], "build": []}}  # series for plotting
     
     for n in sizes:
         print(f"\n→ Testing N={n}...")
         pts = random_points(n)
         wins = random_windows(queries)
         
-        # R-tree
-        rt, rt_build = build(RTree, pts, max_entries)
+        # build both trees concurrently
+        (rt, rt_build), (rs, rs_build) = build_pair(pts, max_entries)
         rt_vis, rt_query = evaluate(rt, wins)
-        
-        # R*-tree
-        rs, rs_build = build(RStarTree, pts, max_entries)
         rs_vis, rs_query = evaluate(rs, wins)
         
         results.append({
@@ -182,6 +269,11 @@ def experiment_scalability(sizes=[500, 1000, 2000, 5000], queries=100, max_entri
             "Avg_Node_Visits": rs_vis,
             "Build_Time(s)": rs_build
         })
+        
+        raw["R-tree"]["visits"].append(rt_vis)
+        raw["R-tree"]["build"].append(rt_build)
+        raw["R*-tree"]["visits"].append(rs_vis)
+        raw["R*-tree"]["build"].append(rs_build)
     
     df = pd.DataFrame(results)
     
@@ -190,8 +282,7 @@ def experiment_scalability(sizes=[500, 1000, 2000, 5000], queries=100, max_entri
     
     # Node visits
     for tree_type in ["R-tree", "R*-tree"]:
-        subset = df[df['Tree'] == tree_type]
-        ax1.plot(subset['N'], subset['Avg_Node_Visits'], marker='o', label=tree_type, linewidth=2)
+        ax1.plot(sizes, raw[tree_type]["visits"], marker='o', label=tree_type, linewidth=2)
     
     ax1.set_xlabel('Dataset Size (N)')
     ax1.set_ylabel('Avg Node Visits')
@@ -201,8 +292,7 @@ def experiment_scalability(sizes=[500, 1000, 2000, 5000], queries=100, max_entri
     
     # Build time
     for tree_type in ["R-tree", "R*-tree"]:
-        subset = df[df['Tree'] == tree_type]
-        ax2.plot(subset['N'], subset['Build_Time(s)'], marker='s', label=tree_type, linewidth=2)
+        ax2.plot(sizes, raw[tree_type]["build"], marker='s', label=tree_type, linewidth=2)
     
     ax2.set_xlabel('Dataset Size (N)')
     ax2.set_ylabel('Build Time (seconds)')
@@ -228,17 +318,17 @@ def experiment_max_entries(n=2000, queries=100, max_vals=[4, 8, 12, 16]):
     wins = random_windows(queries)
     
     results = []
+    raw = {"R-tree": {"visits": [], "height": []},
+           "R*-tree": {"visits": [], "height": []}}  # series for plotting
     
     for m in max_vals:
         print(f"\n→ Testing max_entries={m}...")
         
-        rt, _ = build(RTree, pts, m)
+        (rt, _), (rs, _) = build_pair(pts, m)
         rt_vis, _ = evaluate(rt, wins)
-        rt_height = tree_height(rt.root)
-        
-        rs, _ = build(RStarTree, pts, m)
+        rt_height = rt.height
         rs_vis, _ = evaluate(rs, wins)
-        rs_height = tree_height(rs.root)
+        rs_height = rs.height
         
         results.append({
             "max_entries": m,
@@ -253,6 +343,11 @@ def experiment_max_entries(n=2000, queries=100, max_vals=[4, 8, 12, 16]):
             "Avg_Node_Visits": rs_vis,
             "Tree_Height": rs_height
         })
+        
+        raw["R-tree"]["visits"].append(rt_vis)
+        raw["R-tree"]["height"].append(rt_height)
+        raw["R*-tree"]["visits"].append(rs_vis)
+        raw["R*-tree"]["height"].append(rs_height)
     
     df = pd.DataFrame(results)
     
@@ -261,8 +356,7 @@ def experiment_max_entries(n=2000, queries=100, max_vals=[4, 8, 12, 16]):
     
     # Node visits
     for tree_type in ["R-tree", "R*-tree"]:
-        subset = df[df['Tree'] == tree_type]
-        ax1.plot(subset['max_entries'], subset['Avg_Node_Visits'], marker='o', label=tree_type, linewidth=2)
+        ax1.plot(max_vals, raw[tree_type]["visits"], marker='o', label=tree_type, linewidth=2)
     
     ax1.set_xlabel('max_entries')
     ax1.set_ylabel('Avg Node Visits')
@@ -272,8 +366,7 @@ def experiment_max_entries(n=2000, queries=100, max_vals=[4, 8, 12, 16]):
     
     # Tree height
     for tree_type in ["R-tree", "R*-tree"]:
-        subset = df[df['Tree'] == tree_type]
-        ax2.plot(subset['max_entries'], subset['Tree_Height'], marker='s', label=tree_type, linewidth=2)
+        ax2.plot(max_vals, raw[tree_type]["height"], marker='s', label=tree_type, linewidth=2)
     
     ax2.set_xlabel('max_entries')
     ax2.set_ylabel('Tree Height')
@@ -5,26 +5,45 @@ rstar_tree.py — Stable R-Tree / R*-Tree implementation
 - Base R-tree (linear split) + R*-tree (single-pass forced reinsertion)
 - Range query + node visit counter for experiments
 - Added: clustered_points() for generating Gaussian clusters
+- Nodes store entry MBRs in parallel NumPy arrays (SoA layout) so
+  intersection/enlargement tests run vectorized per node
 """
 
 import random
 from typing import List, Tuple, Any, Optional
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the plain-Python kernel
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
 
 # ==========================================================
 # Geometry: axis-aligned rectangle (MBR)
 # ==========================================================
 
 class Rect:
+    __slots__ = ("x1", "y1", "x2", "y2", "_area")
+
     def __init__(self, x1: float, y1: float, x2: float, y2: float):
         # normalize
         self.x1 = min(x1, x2)
         self.y1 = min(y1, y2)
         self.x2 = max(x1, x2)
         self.y2 = max(y1, y2)
+        self._area = None
 
     def area(self) -> float:
-        return max(0.0, self.x2 - self.x1) * max(0.0, self.y2 - self.y1)
+        # memoized: a Rect is immutable once built
+        a = self._area
+        if a is None:
+            a = self._area = (self.x2 - self.x1) * (self.y2 - self.y1)
+        return a
 
     def enlarge(self, other: "Rect") -> "Rect":
         return Rect(
@@ -35,8 +54,17 @@ class Rect:
         )
 
     def intersects(self, other: "Rect") -> bool:
-        return not (self.x2 < other.x1 or self.x1 > other.x2 or
-                    self.y2 < other.y1 or self.y1 > other.y2)
+        # branchless: all four comparisons always run, no short-circuit jumps
+        return (self.x2 >= other.x1) & (self.x1 <= other.x2) & \
+               (self.y2 >= other.y1) & (self.y1 <= other.y2)
+
+
+try:
+    # compiled fast path (python setup.py build_ext --inplace); same
+    # interface, bounds stored as C doubles and methods run as C code
+    from rstar_core import Rect  # noqa: F811
+except ImportError:
+    pass
 
 
 # ==========================================================
@@ -63,51 +91,76 @@ def make_point_rect(*args) -> Rect:
         raise TypeError(f"make_point_rect() takes 2, 3, or 4 arguments ({len(args)} given)")
 
 
-def random_points(n: int) -> List[Tuple[float, float]]:
-    """Generate n uniformly random points in [0, 1] × [0, 1]"""
-    return [(random.random(), random.random()) for _ in range(n)]
+def _np_rng() -> np.random.Generator:
+    """
+    NumPy generator seeded from the stdlib stream, so random.seed(...)
+    at the top of experiment.py still makes whole runs reproducible.
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
 
+def random_points(n: int) -> np.ndarray:
+    """Generate n uniformly random points in [0, 1] × [0, 1] as an (n, 2) array"""
+    return _np_rng().random((n, 2))
 
-def clustered_points(n: int, num_clusters: int = 4) -> List[Tuple[float, float]]:
+
+def clustered_points(n: int, num_clusters: int = 4) -> np.ndarray:
     """
     Generate clustered points using Gaussian distribution.
-    Creates num_clusters centers, then generates points around each.
-    
+    Creates num_clusters centers, then generates points around each
+    (std=0.08 for moderate clustering), all in vectorized NumPy calls.
+
     Parameters:
     - n: total number of points
     - num_clusters: number of cluster centers
-    
+
     Returns:
-    - List of (x, y) coordinates
+    - (n, 2) array of (x, y) coordinates, clamped to [0, 1]
     """
-    points = []
-    cluster_size = n // num_clusters
-    
-    for _ in range(num_clusters):
-        # Random cluster center
-        cx = random.random()
-        cy = random.random()
-        
-        # Generate points around center (std=0.08 for moderate clustering)
-        for _ in range(cluster_size):
-            x = random.gauss(cx, 0.08)
-            y = random.gauss(cy, 0.08)
-            # Clamp to [0, 1]
-            x = max(0.0, min(1.0, x))
-            y = max(0.0, min(1.0, y))
-            points.append((x, y))
-    
-    # Handle remainder if n not divisible by num_clusters
-    remainder = n - len(points)
+    rng = _np_rng()
+    centers = rng.random((num_clusters, 2))
+    # even split per cluster; leftover points go to random clusters
+    assign = np.repeat(np.arange(num_clusters), n // num_clusters)
+    remainder = n - len(assign)
     if remainder > 0:
-        cx = random.random()
-        cy = random.random()
-        for _ in range(remainder):
-            x = max(0.0, min(1.0, random.gauss(cx, 0.08)))
-            y = max(0.0, min(1.0, random.gauss(cy, 0.08)))
-            points.append((x, y))
-    
-    return points
+        assign = np.concatenate([assign, rng.integers(0, num_clusters, remainder)])
+    noise = rng.normal(0.0, 0.08, (n, 2))
+    return np.clip(centers[assign] + noise, 0.0, 1.0)
+
+
+def hilbert_index(x: np.ndarray, y: np.ndarray, order: int = 16) -> np.ndarray:
+    """
+    Vectorized Hilbert-curve index (xy2d) of integer grid cells on a
+    2^order × 2^order grid. Sorting by this index gives a locality-
+    preserving 1-D ordering used for bulk loading.
+    """
+    x = np.asarray(x, dtype=np.int64).copy()
+    y = np.asarray(y, dtype=np.int64).copy()
+    d = np.zeros(x.shape, dtype=np.int64)
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = ((x & s) > 0).astype(np.int64)
+        ry = ((y & s) > 0).astype(np.int64)
+        d += s * s * ((3 * rx) ^ ry)
+        # rotate quadrant (standard xy2d step, applied as masks)
+        m = ry == 0
+        flip = m & (rx == 1)
+        x[flip] = s - 1 - x[flip]
+        y[flip] = s - 1 - y[flip]
+        xm = x[m]
+        x[m] = y[m]
+        y[m] = xm
+        s >>= 1
+    return d
+
+
+def make_point_rects_bulk(pts, size: float = 0.0) -> np.ndarray:
+    """
+    Batch version of make_point_rect: turn an (n, 2) array (or list) of
+    points into an (n, 4) array of [x, y, x+size, y+size] rectangles.
+    """
+    pts = np.asarray(pts, dtype=np.float64)
+    return np.hstack([pts, pts + size])
 
 
 # ==========================================================
@@ -115,24 +168,153 @@ def clustered_points(n: int, num_clusters: int = 4) -> List[Tuple[float, float]]
 # ==========================================================
 
 class Node:
-    def __init__(self, leaf: bool = False):
+    """
+    Tree node with SoA (structure-of-arrays) entry storage.
+
+    Entry MBRs live in four parallel float64 arrays (x1, y1, x2, y2) plus
+    an object array for children/payloads, sized capacity+1 so one overflow
+    entry fits before the split runs. Keeping bounds contiguous lets
+    intersection and enlargement run as four vectorized comparisons per
+    node instead of n Python-level Rect calls. Arrays are allocated once
+    per node; only a split allocates a new node.
+    """
+
+    __slots__ = ("leaf", "n", "x1", "y1", "x2", "y2", "areas", "children",
+                 "parent", "_mbr")
+
+    def __init__(self, capacity: int, leaf: bool = False):
         self.leaf = leaf
-        # entries: List[Tuple[Rect, Node|Any]]
-        self.entries: List[Tuple[Rect, Any]] = []
+        self.n = 0
+        self.x1 = np.empty(capacity + 1, dtype=np.float64)
+        self.y1 = np.empty(capacity + 1, dtype=np.float64)
+        self.x2 = np.empty(capacity + 1, dtype=np.float64)
+        self.y2 = np.empty(capacity + 1, dtype=np.float64)
+        # per-entry areas, kept alongside the bounds so choose_leaf never
+        # recomputes them during a descent
+        self.areas = np.empty(capacity + 1, dtype=np.float64)
+        self.children = np.empty(capacity + 1, dtype=object)
         self.parent: Optional["Node"] = None
+        # cached union of the stored entry bounds; extended on add,
+        # reset to None whenever entries shrink or are rewritten
+        self._mbr: Optional[Rect] = None
 
     def add(self, rect: Rect, child_or_data: Any):
         # if internal child is Node, wire parent pointer
         if isinstance(child_or_data, Node):
             child_or_data.parent = self
-        self.entries.append((rect, child_or_data))
+        i = self.n
+        self.x1[i] = rect.x1
+        self.y1[i] = rect.y1
+        self.x2[i] = rect.x2
+        self.y2[i] = rect.y2
+        self.areas[i] = rect.area()
+        self.children[i] = child_or_data
+        self.n = i + 1
+        if self._mbr is not None:
+            self._mbr = self._mbr.enlarge(rect)
+        elif i == 0:
+            self._mbr = rect
+
+    def rect_at(self, i: int) -> Rect:
+        return Rect(self.x1[i], self.y1[i], self.x2[i], self.y2[i])
+
+    @property
+    def entries(self) -> List[Tuple[Rect, Any]]:
+        """Compatibility view of the SoA columns as (Rect, child) pairs."""
+        return [(self.rect_at(i), self.children[i]) for i in range(self.n)]
+
+    def intersect_mask(self, rect: Rect) -> np.ndarray:
+        """Boolean mask over the n entries that overlap 'rect'."""
+        n = self.n
+        return ~((self.x2[:n] < rect.x1) | (self.x1[:n] > rect.x2) |
+                 (self.y2[:n] < rect.y1) | (self.y1[:n] > rect.y2))
 
     def mbr(self) -> Rect:
-        assert self.entries, "mbr() called on empty node"
-        r, _ = self.entries[0]
-        for i in range(1, len(self.entries)):
-            r = r.enlarge(self.entries[i][0])
-        return r
+        assert self.n, "mbr() called on empty node"
+        m = self._mbr
+        if m is None:
+            n = self.n
+            m = self._mbr = Rect(self.x1[:n].min(), self.y1[:n].min(),
+                                 self.x2[:n].max(), self.y2[:n].max())
+        return m
+
+
+# ==========================================================
+# Frozen-tree query kernel (JIT-compiled when numba is present)
+# ==========================================================
+
+# fixed-point scale for freeze(quantize=True); unit-square coordinates
+# map to ~30 bits, comfortably inside int32
+QUANT_SCALE = 1 << 30
+
+
+def _quant_lo(a) -> np.ndarray:
+    """Quantize lower bounds, rounding down (conservative: never shrinks)."""
+    v = np.floor(np.asarray(a, dtype=np.float64) * QUANT_SCALE)
+    return np.clip(v, -2**31, 2**31 - 1).astype(np.int32)
+
+
+def _quant_hi(a) -> np.ndarray:
+    """Quantize upper bounds, rounding up (conservative: never shrinks)."""
+    v = np.ceil(np.asarray(a, dtype=np.float64) * QUANT_SCALE)
+    return np.clip(v, -2**31, 2**31 - 1).astype(np.int32)
+
+@njit(cache=True)
+def _range_query_jit(qx1, qy1, qx2, qy2,
+                     nx1, ny1, nx2, ny2,
+                     first_child, n_children, is_leaf,
+                     ex1, ey1, ex2, ey2,
+                     stack, inside, allow_inside, out):
+    """
+    Iterative DFS over the frozen SoA tree (see RTree.freeze()).
+    Writes matching leaf-entry indices into 'out'; returns (count, visits).
+    Children are pushed in reverse so pop order matches the recursive walk.
+    With allow_inside set, a node whose MBR lies fully inside the window
+    is pushed with its 'inside' flag set: its whole subtree matches, so
+    every entry below it is emitted without further intersection tests.
+    Callers may only set allow_inside when stored MBRs are exact
+    (bulk-loaded trees); incremental inserts here do not widen ancestor
+    entries, so a stale MBR contained in the window does not guarantee
+    the entries below it match.
+    """
+    stack[0] = 0  # root
+    inside[0] = False
+    top = 1
+    visits = 0
+    m = 0
+    while top:
+        top -= 1
+        nid = stack[top]
+        ins = inside[top]
+        visits += 1
+        s = first_child[nid]
+        e = s + n_children[nid]
+        if is_leaf[nid]:
+            if ins:
+                for i in range(s, e):
+                    out[m] = i
+                    m += 1
+            else:
+                for i in range(s, e):
+                    if (ex2[i] >= qx1 and ex1[i] <= qx2 and
+                            ey2[i] >= qy1 and ey1[i] <= qy2):
+                        out[m] = i
+                        m += 1
+        elif ins:
+            for c in range(e - 1, s - 1, -1):
+                stack[top] = c
+                inside[top] = True
+                top += 1
+        else:
+            for c in range(e - 1, s - 1, -1):
+                if (nx2[c] >= qx1 and nx1[c] <= qx2 and
+                        ny2[c] >= qy1 and ny1[c] <= qy2):
+                    stack[top] = c
+                    inside[top] = (allow_inside and
+                                   nx1[c] >= qx1 and nx2[c] <= qx2 and
+                                   ny1[c] >= qy1 and ny2[c] <= qy2)
+                    top += 1
+    return m, visits
 
 
 # ==========================================================
@@ -142,8 +324,15 @@ class Node:
 class RTree:
     def __init__(self, max_entries: int = 8):
         self.max_entries = max_entries
-        self.root = Node(leaf=True)
+        self.root = Node(max_entries, leaf=True)
         self.node_visits = 0
+        self.height = 0  # root is a leaf; bumped on each root split
+        self._frozen = None  # flat SoA snapshot built by freeze()
+        # True only while every stored entry MBR exactly covers its
+        # subtree (bulk_load guarantees it; incremental inserts do not
+        # widen ancestor entries, so any insert clears it). Gates the
+        # fully-inside query shortcut.
+        self._exact_mbrs = False
 
     # ---- metric helpers ----
     def _reset(self):
@@ -152,62 +341,282 @@ class RTree:
     def _visit(self):
         self.node_visits += 1
 
+    # ---- frozen (read-only) representation ----
+    def freeze(self, quantize: bool = False):
+        """
+        Snapshot the tree into one flat SoA layout for fast read-only
+        queries: per-node MBR columns (nx1..ny2), first_child/n_children/
+        is_leaf indexed by node id (children of a node get contiguous ids),
+        and a separate SoA for leaf entries. range_query then runs the
+        whole traversal inside _range_query_jit with no Python dispatch.
+        Any later insert invalidates the snapshot.
+
+        quantize=True stores the bound columns as fixed-point int32
+        (QUANT_SCALE), halving snapshot memory and comparing on integer
+        units. Rounding is conservative (bounds only widen), so no true
+        hit is ever lost; a rect lying within 1/QUANT_SCALE (~1e-9) of a
+        window edge may be reported as a hit. Default is exact float64.
+        """
+        nodes = [self.root]
+        if self.root.n:
+            m = self.root.mbr()
+            node_bounds = [(m.x1, m.y1, m.x2, m.y2)]
+        else:
+            # empty tree: bounds that intersect nothing
+            node_bounds = [(np.inf, np.inf, -np.inf, -np.inf)]
+        first_child, n_children, is_leaf = [], [], []
+        ex1, ey1, ex2, ey2 = [], [], [], []
+        payloads = []
+
+        i = 0
+        while i < len(nodes):
+            nd = nodes[i]
+            n = nd.n
+            is_leaf.append(nd.leaf)
+            n_children.append(n)
+            if nd.leaf:
+                first_child.append(len(ex1))
+                ex1.extend(nd.x1[:n])
+                ey1.extend(nd.y1[:n])
+                ex2.extend(nd.x2[:n])
+                ey2.extend(nd.y2[:n])
+                payloads.extend(nd.children[:n])
+            else:
+                first_child.append(len(nodes))
+                for j in range(n):
+                    nodes.append(nd.children[j])
+                    # use the stored parent-entry bounds, exactly what the
+                    # tree-walking query tests before descending
+                    node_bounds.append((nd.x1[j], nd.y1[j], nd.x2[j], nd.y2[j]))
+            i += 1
+
+        nb = np.array(node_bounds, dtype=np.float64)
+        if quantize:
+            cols = (_quant_lo(nb[:, 0]), _quant_lo(nb[:, 1]),
+                    _quant_hi(nb[:, 2]), _quant_hi(nb[:, 3]),
+                    _quant_lo(ex1), _quant_lo(ey1),
+                    _quant_hi(ex2), _quant_hi(ey2))
+        else:
+            cols = (nb[:, 0].copy(), nb[:, 1].copy(),
+                    nb[:, 2].copy(), nb[:, 3].copy(),
+                    np.array(ex1, dtype=np.float64), np.array(ey1, dtype=np.float64),
+                    np.array(ex2, dtype=np.float64), np.array(ey2, dtype=np.float64))
+        self._frozen = (
+            cols[0], cols[1], cols[2], cols[3],
+            np.array(first_child, dtype=np.int64),
+            np.array(n_children, dtype=np.int64),
+            np.array(is_leaf, dtype=np.bool_),
+            cols[4], cols[5], cols[6], cols[7],
+            np.empty(len(nodes), dtype=np.int64),   # traversal stack
+            np.empty(len(nodes), dtype=np.bool_),   # fully-inside flags
+            self._exact_mbrs,
+            np.empty(max(1, len(payloads)), dtype=np.int64),  # output buffer
+            payloads,
+        )
+
+    def _frozen_query(self, rect: Rect):
+        (nx1, ny1, nx2, ny2, first_child, n_children, is_leaf,
+         ex1, ey1, ex2, ey2, stack, inside, allow_inside,
+         out, payloads) = self._frozen
+        if nx1.dtype == np.int32:
+            # quantized snapshot: put the window on the same integer grid,
+            # widened the same conservative way as the stored bounds
+            qx1 = np.int64(np.floor(rect.x1 * QUANT_SCALE))
+            qy1 = np.int64(np.floor(rect.y1 * QUANT_SCALE))
+            qx2 = np.int64(np.ceil(rect.x2 * QUANT_SCALE))
+            qy2 = np.int64(np.ceil(rect.y2 * QUANT_SCALE))
+        else:
+            qx1, qy1, qx2, qy2 = rect.x1, rect.y1, rect.x2, rect.y2
+        m, visits = _range_query_jit(qx1, qy1, qx2, qy2,
+                                     nx1, ny1, nx2, ny2,
+                                     first_child, n_children, is_leaf,
+                                     ex1, ey1, ex2, ey2,
+                                     stack, inside, allow_inside, out)
+        self.node_visits += visits
+        return [payloads[i] for i in out[:m]]
+
     # ---- queries ----
     def range_query(self, rect: Rect, node: Optional[Node] = None):
         if node is None:
+            if self._frozen is not None:
+                return self._frozen_query(rect)
             node = self.root
-        self._visit()
 
+        # iterative DFS: one stack and one output list for the whole query,
+        # no per-level call frames or throwaway intermediate lists. Nodes
+        # whose MBR lies fully inside the window carry a True flag: their
+        # whole subtree matches, so no intersection tests run below them.
+        # Only sound while stored MBRs are exact — see _exact_mbrs.
+        allow_inside = self._exact_mbrs
+        qx1, qy1, qx2, qy2 = rect.x1, rect.y1, rect.x2, rect.y2
+        stack = [(node, False)]
         out = []
-        for r, c in node.entries:
-            if not rect.intersects(r):
+        pop = stack.pop          # hoist bound methods out of the loop
+        push = stack.extend
+        emit = out.extend
+        visits = 0
+        while stack:
+            nd, inside = pop()
+            visits += 1
+            n = nd.n
+            kids = nd.children[:n]
+            if inside:
+                if nd.leaf:
+                    emit(kids)  # data
+                else:
+                    push((c, True) for c in kids[::-1])
                 continue
-            if node.leaf:
-                out.append(c)  # data
+            mask = nd.intersect_mask(rect)
+            if nd.leaf:
+                emit(kids[mask])  # data
             else:
-                out.extend(self.range_query(rect, c))
+                if allow_inside:
+                    contained = ((nd.x1[:n] >= qx1) & (nd.x2[:n] <= qx2) &
+                                 (nd.y1[:n] >= qy1) & (nd.y2[:n] <= qy2))
+                    # reversed: pop order matches recursion
+                    push(zip(kids[mask][::-1], contained[mask][::-1]))
+                else:
+                    push((c, False) for c in kids[mask][::-1])
+        self.node_visits += visits
         return out
 
     # ---- insert path ----
     def choose_leaf(self, node: Node, rect: Rect) -> Node:
-        # heuristic: minimal area enlargement; tie by area
-        if node.leaf:
-            return node
-        best_child = None
-        best_key = None
-        for r, child in node.entries:
-            inc = r.enlarge(rect).area() - r.area()
-            key = (inc, r.area())
-            if best_key is None or key < best_key:
-                best_key = key
-                best_child = child
-        return self.choose_leaf(best_child, rect)
+        return self._choose_leaf_bounds(node, rect.x1, rect.y1, rect.x2, rect.y2)
+
+    def _choose_leaf_bounds(self, node: Node,
+                            rx1: float, ry1: float,
+                            rx2: float, ry2: float) -> Node:
+        # heuristic: minimal area enlargement; tie by area.
+        # iterative descent: one loop per level, query bounds hoisted to
+        # locals, no recursion frame per level
+        while not node.leaf:
+            n = node.n
+            x1, y1, x2, y2 = node.x1[:n], node.y1[:n], node.x2[:n], node.y2[:n]
+            area = node.areas[:n]
+            inc = ((np.maximum(x2, rx2) - np.minimum(x1, rx1)) *
+                   (np.maximum(y2, ry2) - np.minimum(y1, ry1))) - area
+            node = node.children[np.lexsort((area, inc))[0]]
+        return node
 
     def insert(self, rect: Rect, data: Any):
+        self._frozen = None
+        self._exact_mbrs = False
         leaf = self.choose_leaf(self.root, rect)
         leaf.add(rect, data)
-        if len(leaf.entries) > self.max_entries:
+        if leaf.n > self.max_entries:
+            self.adjust_after_split(leaf)
+
+    def insert_point(self, x: float, y: float, size: float, data: Any):
+        """
+        Fast path for the [x, x+size] × [y, y+size] point-rects every
+        caller in experiment.py inserts: the descent runs on four scalar
+        bounds and the single stored Rect is built only at the leaf.
+        """
+        self._frozen = None
+        self._exact_mbrs = False
+        leaf = self._choose_leaf_bounds(self.root, x, y, x + size, y + size)
+        leaf.add(Rect(x, y, x + size, y + size), data)
+        if leaf.n > self.max_entries:
             self.adjust_after_split(leaf)
 
+    def insert_bulk(self, rects: np.ndarray, payloads):
+        """Insert an (N, 4) array of rectangles with matching payloads."""
+        for (x1, y1, x2, y2), p in zip(rects, payloads):
+            self.insert(Rect(x1, y1, x2, y2), p)
+
+    def bulk_load(self, rects: np.ndarray, payloads):
+        """
+        Hilbert-sorted bottom-up packing for callers that have all data
+        up front. Entries are sorted by the Hilbert index of their rect
+        centers, packed sequentially into full leaves, then parent levels
+        are packed the same way until one root remains — no choose_leaf,
+        no splits. Replaces whatever the tree held before.
+
+        Note: this bypasses the insertion algorithm entirely, so a
+        bulk-loaded RTree and RStarTree are identical by construction.
+        """
+        self._frozen = None
+        rects = np.asarray(rects, dtype=np.float64)
+        payloads = list(payloads)
+        cap = self.max_entries
+        n = len(rects)
+        if n == 0:
+            self.root = Node(cap, leaf=True)
+            self.height = 0
+            return
+
+        # Hilbert order of rect centers on a 2^16 grid (normalized so
+        # inputs need not lie in the unit square)
+        cx = (rects[:, 0] + rects[:, 2]) / 2.0
+        cy = (rects[:, 1] + rects[:, 3]) / 2.0
+        grid = (1 << 16) - 1
+        gx = ((cx - cx.min()) / (np.ptp(cx) or 1.0) * grid).astype(np.int64)
+        gy = ((cy - cy.min()) / (np.ptp(cy) or 1.0) * grid).astype(np.int64)
+        order = np.argsort(hilbert_index(gx, gy), kind="stable")
+
+        sx1, sy1 = rects[order, 0], rects[order, 1]
+        sx2, sy2 = rects[order, 2], rects[order, 3]
+
+        # pack leaves
+        level = []
+        for s in range(0, n, cap):
+            m = min(s + cap, n) - s
+            nd = Node(cap, leaf=True)
+            nd.x1[:m] = sx1[s:s + m]
+            nd.y1[:m] = sy1[s:s + m]
+            nd.x2[:m] = sx2[s:s + m]
+            nd.y2[:m] = sy2[s:s + m]
+            nd.areas[:m] = (sx2[s:s + m] - sx1[s:s + m]) * \
+                           (sy2[s:s + m] - sy1[s:s + m])
+            for j in range(m):
+                nd.children[j] = payloads[order[s + j]]
+            nd.n = m
+            level.append(nd)
+
+        # pack parent levels until a single root remains
+        height = 0
+        while len(level) > 1:
+            parents = []
+            for s in range(0, len(level), cap):
+                p = Node(cap, leaf=False)
+                for child in level[s:s + cap]:
+                    p.add(child.mbr(), child)
+                parents.append(p)
+            level = parents
+            height += 1
+
+        self.root = level[0]
+        self.root.parent = None
+        self.height = height
+        self._exact_mbrs = True  # packed entries are exact child MBRs
+
     # ---- split + upward adjust (SAFE PARENT VERSION) ----
     def split_node(self, node: Node) -> Node:
         """
         Linear split: cut entries into two halves.
-        Also fixes children's parent pointers for both halves.
+        Copies the upper half's SoA columns into a fresh node and
+        re-parents only the children that moved.
         """
-        half = max(1, len(node.entries) // 2)
-        new_node = Node(leaf=node.leaf)
-
-        # slice
-        right_half = node.entries[half:]
-        node.entries = node.entries[:half]
-        new_node.entries = right_half
-
-        # fix parent pointers in both halves (internal only)
+        half = max(1, node.n // 2)
+        new_node = Node(self.max_entries, leaf=node.leaf)
+
+        # copy upper half columns, shrink the original in place
+        m = node.n - half
+        new_node.x1[:m] = node.x1[half:node.n]
+        new_node.y1[:m] = node.y1[half:node.n]
+        new_node.x2[:m] = node.x2[half:node.n]
+        new_node.y2[:m] = node.y2[half:node.n]
+        new_node.areas[:m] = node.areas[half:node.n]
+        new_node.children[:m] = node.children[half:node.n]
+        new_node.n = m
+        node.n = half
+        node._mbr = None  # entries shrank; recompute lazily
+
+        # fix parent pointers for the half that moved (internal only);
+        # the lower half's children already point at 'node'
         if not node.leaf:
-            for _, child in node.entries:
-                child.parent = node
-            for _, child in new_node.entries:
+            for child in new_node.children[:m]:
                 child.parent = new_node
 
         return new_node
@@ -221,27 +630,33 @@ class RTree:
         new_node = self.split_node(node)
 
         if node is self.root:
-            new_root = Node(leaf=False)
+            new_root = Node(self.max_entries, leaf=False)
             new_root.add(node.mbr(), node)
             new_root.add(new_node.mbr(), new_node)
             node.parent = new_root
             new_node.parent = new_root
             self.root = new_root
+            self.height += 1
             return
 
         parent = node.parent
         parent.add(new_node.mbr(), new_node)
-        if len(parent.entries) > self.max_entries:
+        if parent.n > self.max_entries:
             self.adjust_after_split(parent)
 
     # convenience (used by R*-tree reinsertion to update mbrs up the path)
     def _bubble_up_mbr(self, node: Optional[Node]):
         while node and node.parent:
             p = node.parent
-            new_m = node.mbr()
-            for i, (r, c) in enumerate(p.entries):
-                if c is node:
-                    p.entries[i] = (new_m, c)
+            new_m = node.mbr()  # cached on the child unless it shrank
+            for i in range(p.n):
+                if p.children[i] is node:
+                    p.x1[i] = new_m.x1
+                    p.y1[i] = new_m.y1
+                    p.x2[i] = new_m.x2
+                    p.y2[i] = new_m.y2
+                    p.areas[i] = new_m.area()
+                    p._mbr = None  # stored entry changed; recompute lazily
                     break
             node = p
 
@@ -256,14 +671,25 @@ class RStarTree(RTree):
         self.reinsertion_ratio = reinsertion_ratio  # 0.2–0.3 recommended
 
     def insert(self, rect: Rect, data: Any):
+        self._frozen = None
+        self._exact_mbrs = False
         leaf = self.choose_leaf(self.root, rect)
         leaf.add(rect, data)
+        self._handle_overflow(leaf)
+
+    def insert_point(self, x: float, y: float, size: float, data: Any):
+        self._frozen = None
+        self._exact_mbrs = False
+        leaf = self._choose_leaf_bounds(self.root, x, y, x + size, y + size)
+        leaf.add(Rect(x, y, x + size, y + size), data)
+        self._handle_overflow(leaf)
 
-        if len(leaf.entries) > self.max_entries:
+    def _handle_overflow(self, leaf: Node):
+        if leaf.n > self.max_entries:
             self._forced_reinsert_once(leaf)
 
         # still overflow? split
-        if len(leaf.entries) > self.max_entries:
+        if leaf.n > self.max_entries:
             self.adjust_after_split(leaf)
         else:
             self._bubble_up_mbr(leaf)
@@ -273,27 +699,39 @@ class RStarTree(RTree):
         Remove farthest k entries from node and reinsert from the root.
         Only once for the current overflow to avoid ping-pong loops.
         """
-        entries = list(node.entries)
-        if len(entries) <= self.max_entries:
+        n = node.n
+        if n <= self.max_entries:
             return
 
         m = node.mbr()
         cx = (m.x1 + m.x2) / 2.0
         cy = (m.y1 + m.y2) / 2.0
 
-        ranked = sorted(
-            entries,
-            key=lambda rc: ((rc[0].x1 + rc[0].x2) / 2.0 - cx) ** 2 +
-                           ((rc[0].y1 + rc[0].y2) / 2.0 - cy) ** 2,
-            reverse=True
-        )
-
-        k = max(1, int(round(self.reinsertion_ratio * len(entries))))
-        k = min(k, len(entries) - 1)  # keep at least one
-
-        to_reinsert = ranked[:k]
-        keep = [e for e in entries if e not in to_reinsert]
-        node.entries = keep
+        # squared distance of each entry center to the node center, vectorized
+        d2 = ((node.x1[:n] + node.x2[:n]) / 2.0 - cx) ** 2 + \
+             ((node.y1[:n] + node.y2[:n]) / 2.0 - cy) ** 2
+
+        k = max(1, int(round(self.reinsertion_ratio * n)))
+        k = min(k, n - 1)  # keep at least one
+
+        # O(n) selection of the k farthest, then order just those k by
+        # distance so reinsertion order matches a full descending sort
+        drop = np.argpartition(-d2, k - 1)[:k]
+        drop = drop[np.argsort(-d2[drop], kind="stable")]
+
+        to_reinsert = [(node.rect_at(i), node.children[i]) for i in drop]
+
+        # compact the kept entries in place (original order preserved)
+        keep = np.ones(n, dtype=bool)
+        keep[drop] = False
+        node.x1[:n - k] = node.x1[:n][keep]
+        node.y1[:n - k] = node.y1[:n][keep]
+        node.x2[:n - k] = node.x2[:n][keep]
+        node.y2[:n - k] = node.y2[:n][keep]
+        node.areas[:n - k] = node.areas[:n][keep]
+        node.children[:n - k] = node.children[:n][keep]
+        node.n = n - k
+        node._mbr = None  # entries shrank; recompute lazily
 
         for r, payload in to_reinsert:
             super().insert(r, payload)
@@ -0,0 +1,16 @@
+"""
+Optional build script for the compiled Rect extension:
+
+    python setup.py build_ext --inplace
+
+Everything runs fine without it; rstar_tree falls back to the
+pure-Python Rect when rstar_core is not importable.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="rstar_core",
+    ext_modules=cythonize("rstar_core.pyx"),
+)